@@ -7,5 +7,14 @@ from .argbind import (
     dump_args,
     load_args,
     get_used_args,
-    scope
-)
\ No newline at end of file
+    record_used_args,
+    register_converter,
+    scope,
+    sweep,
+    Executor,
+    share,
+    watch,
+    profile,
+    stats
+)
+from .static import build_static_parser
@@ -0,0 +1,432 @@
+# Static scanning of scripts for bound functions, without importing them,
+# and the argbind command, which uses it. Like argbind.py, heavy 
+# dependencies are imported where they are first used.
+from __future__ import annotations
+from collections import namedtuple
+import os
+import warnings
+
+from .argbind import (
+    _FunctionSpec,
+    _action_converter,
+    _docstring_help,
+    _function_arguments,
+    _parser_actions,
+    _parser_from_specs,
+    load_args,
+)
+
+class _Unresolved(Exception):
+    pass
+
+def _static_value(node, namespace):
+    """Evaluates an annotation or default value in the source of a 
+    script, without executing it. Literals are evaluated as is. Names
+    are looked up in namespace. Anything else raises _Unresolved.
+    """
+    import ast
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, str) and namespace is not None:
+            # String annotation, e.g. "List[int]".
+            try:
+                return _static_value(ast.parse(value, mode='eval').body, namespace)
+            except SyntaxError:
+                raise _Unresolved(value)
+        return value
+    if isinstance(node, ast.Name) and namespace is not None:
+        if node.id in namespace:
+            return namespace[node.id]
+        raise _Unresolved(node.id)
+    if isinstance(node, ast.Attribute) and namespace is not None:
+        # e.g. typing.List
+        if isinstance(node.value, ast.Name) and node.attr in namespace:
+            return namespace[node.attr]
+        raise _Unresolved(node.attr)
+    if isinstance(node, ast.Subscript) and namespace is not None:
+        base = _static_value(node.value, namespace)
+        index = node.slice
+        if isinstance(index, ast.Tuple):
+            index = tuple(_static_value(x, namespace) for x in index.elts)
+        else:
+            index = _static_value(index, namespace)
+        try:
+            return base[index]
+        except TypeError:
+            raise _Unresolved(base)
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise _Unresolved(node)
+
+def _static_types():
+    import typing
+
+    namespace = {
+        name: getattr(typing, name) for name in 
+        ['List', 'Dict', 'Tuple', 'Optional', 'Union', 'Any', 'Literal']
+        if hasattr(typing, name)
+    }
+    namespace.update({
+        t.__name__: t for t in [int, float, str, bool, list, dict, tuple]
+    })
+    namespace['None'] = None
+    return namespace
+
+_StaticFunction = namedtuple(
+    '_StaticFunction', 
+    ['prefix', 'parameters', 'doc', 'patterns', 'without_prefix', 
+     'positional', 'group']
+)
+
+class _Scanner:
+    """Finds the functions and classes bound with argbind.bind in a 
+    script, in the order they would be bound when it runs. Modules 
+    imported by the script from the same folder are scanned too.
+    Only module level code and class bodies are scanned, as they are
+    what runs when the script is imported.
+    """
+    def __init__(self, follow_imports=True):
+        self.follow_imports = follow_imports
+        self.functions = {}
+        self.scanned = {}
+        self.sources = {}
+        self.types = _static_types()
+
+    def scan(self, path):
+        import ast
+
+        path = os.path.realpath(path)
+        if path in self.scanned:
+            return self.scanned[path]
+        definitions = self.scanned[path] = {}
+
+        with open(path, 'rb') as f:
+            source = f.read()
+        tree = ast.parse(source, filename=path)
+        self.sources[path] = source.decode('utf-8', errors='replace')
+
+        aliases = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                aliases.update(
+                    a.asname or a.name for a in node.names if a.name == 'argbind')
+            elif isinstance(node, ast.ImportFrom) and node.module in (
+                    'argbind', 'argbind.argbind'):
+                aliases.update(
+                    f'.{a.asname or a.name}' for a in node.names 
+                    if a.name in ('bind', 'bind_to_parser')
+                )
+
+        self._scan_body(tree.body, path, '', definitions, aliases)
+        return definitions
+
+    def _is_bind(self, node, aliases):
+        import ast
+
+        if isinstance(node, ast.Call):
+            node = node.func
+        if isinstance(node, ast.Name):
+            return f'.{node.id}' in aliases
+        return (
+            isinstance(node, ast.Attribute) and 
+            node.attr in ('bind', 'bind_to_parser') and
+            isinstance(node.value, ast.Name) and node.value.id in aliases
+        )
+
+    def _resolve_import(self, path, module, level):
+        folder = os.path.dirname(path)
+        for _ in range(max(level - 1, 0)):
+            folder = os.path.dirname(folder)
+        if not module:
+            return None
+        base = os.path.join(folder, *module.split('.'))
+        for candidate in [base + '.py', os.path.join(base, '__init__.py')]:
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def _scan_body(self, body, path, qualname, definitions, aliases):
+        import ast
+
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)) and self.follow_imports:
+                self._scan_import(node, path, definitions)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self._scan_definition(node, path, qualname, definitions, aliases)
+            elif isinstance(node, (ast.Expr, ast.Assign)) and not qualname:
+                call = node.value
+                if (
+                    isinstance(call, ast.Call) and self._is_bind(call, aliases)
+                    and call.args and isinstance(call.args[0], ast.Name)
+                    and call.args[0].id in definitions
+                ):
+                    self._add(definitions[call.args[0].id], call, call.args[1:])
+            elif isinstance(node, (ast.If, ast.Try, ast.With)) and not qualname:
+                for block in ['body', 'orelse', 'finalbody']:
+                    self._scan_body(
+                        getattr(node, block, []), path, qualname, definitions, aliases)
+                for handler in getattr(node, 'handlers', []):
+                    self._scan_body(
+                        handler.body, path, qualname, definitions, aliases)
+
+    def _scan_import(self, node, path, definitions):
+        import ast
+
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                module_path = self._resolve_import(path, alias.name, 1)
+                if module_path is not None:
+                    self.scan(module_path)
+            return
+        module_path = self._resolve_import(path, node.module, max(node.level, 1))
+        if module_path is None:
+            return
+        imported = self.scan(module_path)
+        for alias in node.names:
+            if alias.name in imported:
+                definitions[alias.asname or alias.name] = imported[alias.name]
+
+    def _scan_definition(self, node, path, qualname, definitions, aliases):
+        import ast
+
+        name = f'{qualname}{node.name}'
+        is_class = isinstance(node, ast.ClassDef)
+        if is_class:
+            # The class body runs (and binds its methods) before the 
+            # class itself is decorated.
+            self._scan_body(node.body, path, f'{name}.', {}, aliases)
+            init = [
+                x for x in node.body if isinstance(x, ast.FunctionDef) 
+                and x.name == '__init__'
+            ]
+            target = (name, init[0], path) if init else None
+            if target is None:
+                # Bound classes without an __init__ are bound under the
+                # name of the base class that defines it.
+                for base in node.bases:
+                    if isinstance(base, ast.Name) and base.id in definitions:
+                        target = definitions[base.id]
+                        break
+        else:
+            target = (name, node, path)
+
+        if not qualname:
+            if target is not None:
+                definitions[node.name] = target
+            else:
+                definitions.pop(node.name, None)
+
+        # Decorators are applied bottom up.
+        for decorator in reversed(node.decorator_list):
+            if self._is_bind(decorator, aliases):
+                if target is None:
+                    warnings.warn(
+                        f"Could not find the __init__ of bound class {name} "
+                        f"in {path}, skipping it.")
+                    break
+                patterns = decorator.args if isinstance(decorator, ast.Call) else []
+                self._add(target, decorator, patterns)
+
+    def _add(self, target, call, patterns):
+        import ast
+        import inspect
+
+        prefix, node, path = target
+        if prefix in self.functions:
+            return
+
+        keywords = {}
+        for keyword in getattr(call, 'keywords', []):
+            try:
+                keywords[keyword.arg] = _static_value(keyword.value, None)
+            except _Unresolved:
+                warnings.warn(
+                    f"Could not resolve {keyword.arg} when binding {prefix}, "
+                    "ignoring it.")
+        try:
+            patterns = [_static_value(p, None) for p in patterns]
+        except _Unresolved:
+            warnings.warn(f"Could not resolve the patterns of {prefix}, ignoring them.")
+            patterns = []
+
+        positional = keywords.get('positional', False)
+        if positional and patterns:
+            patterns = []
+        group = keywords.get('group', 'default')
+        if isinstance(group, str):
+            group = [group]
+
+        arguments = node.args
+        params = getattr(arguments, 'posonlyargs', []) + arguments.args
+        defaults = (
+            [inspect.Parameter.empty] * (len(params) - len(arguments.defaults)) + 
+            list(arguments.defaults)
+        )
+        params = list(zip(params, defaults))
+        if arguments.vararg is not None:
+            params.append((arguments.vararg, inspect.Parameter.empty))
+        params.extend(zip(
+            arguments.kwonlyargs, 
+            [inspect.Parameter.empty if d is None else d for d in arguments.kw_defaults]
+        ))
+        if arguments.kwarg is not None:
+            params.append((arguments.kwarg, inspect.Parameter.empty))
+
+        parameters = []
+        for arg, default in params:
+            annotation = inspect.Parameter.empty
+            if default is not inspect.Parameter.empty:
+                try:
+                    default = _static_value(default, None)
+                except _Unresolved:
+                    # Keep the source of defaults that can't be evaluated 
+                    # statically, and treat them as strings whatever 
+                    # their annotation, since they can't be converted.
+                    parameters.append(
+                        (arg.arg, self._source(path, default), str))
+                    continue
+            if arg.annotation is not None:
+                try:
+                    annotation = _static_value(arg.annotation, self.types)
+                except _Unresolved:
+                    annotation = str
+            parameters.append((arg.arg, default, annotation))
+
+        self.functions[prefix] = _StaticFunction(
+            prefix, parameters, ast.get_docstring(node, clean=False), patterns, 
+            keywords.get('without_prefix', False), positional, group
+        )
+
+    def _source(self, path, node):
+        import ast
+
+        return ast.get_source_segment(self.sources[path], node)
+
+def _static_specs(paths, group="default", follow_imports=True):
+    """Specs of the functions bound in the given scripts, found by 
+    scanning their source (see build_static_parser).
+    """
+    scanner = _Scanner(follow_imports)
+    for path in paths:
+        scanner.scan(path)
+
+    if isinstance(group, str):
+        group = [group]
+    if "default" not in group:
+        group.append("default")
+
+    specs = []
+    for fn in scanner.functions.values():
+        if not set(fn.group) & set(group):
+            continue
+        arguments = _function_arguments(
+            fn.prefix, fn.parameters, fn.patterns, fn.without_prefix, fn.positional)
+        last_key = fn.parameters[-1][0] if fn.parameters else None
+        help = (fn.doc, fn.prefix, fn.patterns, fn.without_prefix, last_key)
+        specs.append(_FunctionSpec(fn.prefix, arguments, _docstring_help(*help)))
+    return specs
+
+def build_static_parser(paths: list | str, group: list | str = "default",
+                        follow_imports: bool = True, prog: str = None):
+    """Builds the argument parser that the given scripts would build 
+    with build_parser, by scanning their source for functions and 
+    classes bound with argbind.bind, instead of importing them. This is 
+    much faster for scripts with heavy imports.
+
+    Only bindings that can be found statically are picked up: decorators,
+    and calls to argbind.bind on functions or classes defined in the 
+    scanned files, with literal patterns and keyword arguments. Types 
+    that aren't builtins or from typing are treated as strings, and 
+    bind_module is not supported.
+
+    Parameters
+    ----------
+    paths : Union[list, str]
+        Path or paths of the scripts to scan.
+    group : Union[list, str], optional
+        Groups of bound functions to add to the parser, by default "default"
+    follow_imports : bool, optional
+        Whether to also scan modules the scripts import from their own 
+        folder, by default True
+    prog : str, optional
+        Name of the program in the usage, by default the name of the 
+        first script.
+
+    Returns
+    -------
+    ArgumentParser
+        Argument parser built by ArgBind.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    if prog is None:
+        prog = os.path.basename(paths[0])
+    specs = _static_specs(paths, group, follow_imports)
+    return _parser_from_specs(specs, lazy_help=False, prog=prog)
+
+def _check_args(p, args):
+    """Checks that loaded arguments match the arguments of the parser.
+    Returns a list of problems.
+    """
+    actions = _parser_actions(p)
+
+    problems = []
+    for key, val in args.items():
+        if key.startswith('args.'):
+            continue
+        if key not in actions:
+            problems.append(f"{key}: not an argument of any bound function.")
+            continue
+        converter = _action_converter(actions[key])
+        if converter is None or val is None:
+            continue
+        try:
+            converter.coerce(val)
+        except (ValueError, TypeError):
+            problems.append(
+                f"{key}: expected {converter.__name__}, "
+                f"got {type(val).__name__} {val!r}.")
+    return problems
+
+def main(argv: list = None):
+    """Entry point of the argbind command. Prints the help of scripts, 
+    or checks configuration files against them, without importing them.
+    """
+    import argparse
+
+    p = argparse.ArgumentParser(
+        prog='argbind',
+        description="Inspect the arguments bound in ArgBind scripts, "
+                    "without running them.")
+    commands = p.add_subparsers(dest='command')
+    commands.required = True
+
+    help_command = commands.add_parser(
+        'help', help="Print the help of a script.")
+    check_command = commands.add_parser(
+        'check', help="Check that a .yml file only sets arguments of a script, "
+                      "with values of the right type.")
+    check_command.add_argument('config', help="Path to the .yml file.")
+    for command in [help_command, check_command]:
+        command.add_argument('scripts', nargs='+', help="Paths to the scripts.")
+        command.add_argument('--group', action='append', default=None,
+            help="Group of bound functions to include, can be repeated.")
+        command.add_argument('--no-follow-imports', action='store_true',
+            help="Don't scan the modules the scripts import from their folder.")
+
+    options = p.parse_args(argv)
+    parser = build_static_parser(
+        options.scripts, group=options.group or 'default', 
+        follow_imports=not options.no_follow_imports
+    )
+
+    if options.command == 'help':
+        parser.print_help()
+        return 0
+
+    problems = _check_args(parser, load_args(options.config))
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
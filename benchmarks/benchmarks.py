@@ -0,0 +1,153 @@
+"""Benchmarks for ArgBind, in the format used by airspeed velocity (asv).
+
+Each benchmark builds a synthetic registry of bound functions, with 
+four arguments each, bound under several scope patterns. Run them with
+`asv run`, or without asv via `python benchmarks/run.py`, which writes
+the results as JSON.
+"""
+import os
+import sys
+import tempfile
+
+import argbind
+from argbind import argbind as _argbind
+
+PATTERNS = ('train', 'val', 'test')
+SIZES = [10, 1000, 10000]
+
+FUNC_TEMPLATE = '''
+def func{i}(x: int = {i}, y: float = 0.5, name: str = 'name', flag: bool = False):
+    """Synthetic function {i}.
+
+    Parameters
+    ----------
+    x : int, optional
+        An integer, by default {i}
+    y : float, optional
+        A float, by default 0.5
+    name : str, optional
+        A string, by default 'name'
+    flag : bool, optional
+        A flag, by default False
+    """
+    return x
+'''
+
+def make_registry(n_funcs, patterns=PATTERNS):
+    """Replaces the bound functions with n_funcs synthetic ones.
+
+    Returns
+    -------
+    tuple
+        The bound functions, and arguments for all of them, like the
+        ones parse_args returns, with every argument also scoped to
+        the first pattern.
+    """
+    _argbind.PARSE_FUNCS.clear()
+    namespace = {}
+    funcs = []
+    args = {}
+    for i in range(n_funcs):
+        exec(FUNC_TEMPLATE.format(i=i), namespace)
+        funcs.append(argbind.bind(namespace[f'func{i}'], *patterns))
+        for key, val in [('x', i), ('y', 0.5), ('name', 'name'), ('flag', False)]:
+            args[f'func{i}.{key}'] = val
+            args[f'{patterns[0]}/func{i}.{key}'] = val
+    return funcs, args
+
+class _Registry:
+    params = [SIZES]
+    param_names = ['n_funcs']
+
+    def setup(self, n_funcs):
+        self._parse_funcs = dict(_argbind.PARSE_FUNCS)
+        self.funcs, self.args = make_registry(n_funcs)
+
+    def teardown(self, n_funcs):
+        _argbind.PARSE_FUNCS.clear()
+        _argbind.PARSE_FUNCS.update(self._parse_funcs)
+
+class BoundCall(_Registry):
+    """Overhead of calling a bound function, inside a scope."""
+    params = [[10], ['', 'train']]
+    param_names = ['n_funcs', 'pattern']
+
+    def setup(self, n_funcs, pattern):
+        super().setup(n_funcs)
+        self.func = self.funcs[0]
+        self.scope = argbind.scope(self.args, pattern)
+        self.scope.__enter__()
+
+    def teardown(self, n_funcs, pattern):
+        self.scope.__exit__(None, None, None)
+        super().teardown(n_funcs)
+
+    def time_call(self, n_funcs, pattern):
+        self.func()
+
+    def time_call_with_kwargs(self, n_funcs, pattern):
+        self.func(x=1, name='other')
+
+class UnboundCall:
+    """Baseline for BoundCall."""
+    def setup(self):
+        exec(FUNC_TEMPLATE.format(i=0), globals())
+        self.func = globals()['func0']
+
+    def time_call(self):
+        self.func()
+
+class Scope(_Registry):
+    def time_enter_exit(self, n_funcs):
+        with argbind.scope(self.args):
+            pass
+
+    def time_enter_exit_pattern(self, n_funcs):
+        with argbind.scope(self.args, 'train'):
+            pass
+
+class BuildParser(_Registry):
+    timeout = 300
+
+    def time_build_parser(self, n_funcs):
+        argbind.build_parser()
+
+    def time_build_parser_lazy_help(self, n_funcs):
+        argbind.build_parser(lazy_help=True)
+
+    def time_format_help(self, n_funcs):
+        argbind.build_parser().format_help()
+
+class ParseArgs(_Registry):
+    timeout = 300
+
+    def setup(self, n_funcs):
+        super().setup(n_funcs)
+        self.argv = sys.argv
+        sys.argv = ['benchmark', '--func0.x=5', '--train/func0.name=train']
+
+    def teardown(self, n_funcs):
+        sys.argv = self.argv
+        super().teardown(n_funcs)
+
+    def time_parse_args(self, n_funcs):
+        argbind.parse_args()
+
+class LoadDumpArgs(_Registry):
+    timeout = 300
+
+    def setup(self, n_funcs):
+        super().setup(n_funcs)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'args.yml')
+        argbind.dump_args(self.args, self.path)
+
+    def teardown(self, n_funcs):
+        self.tmpdir.cleanup()
+        super().teardown(n_funcs)
+
+    def time_load_args(self, n_funcs):
+        argbind.load_args(self.path)
+
+    def time_dump_args(self, n_funcs):
+        argbind.dump_args(self.args, self.path)
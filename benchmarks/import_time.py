@@ -0,0 +1,51 @@
+"""Checks that `import argbind` stays fast.
+
+Runs `python -X importtime -c "import argbind"` a few times, and takes
+the fastest cumulative import time of the argbind package. Exits with a
+non-zero status if it is over budget, or if any of the heavy dependencies
+that argbind imports lazily were imported. Byte-compile argbind first
+(`python -m compileall argbind`), otherwise compilation is measured too.
+
+Usage:
+    python benchmarks/import_time.py [--budget_us 5000] [--repeats 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+LAZY_MODULES = ['yaml', 'docstring_parser', 'argparse', 'inspect', 'ast', 'textwrap']
+
+def measure(repeats):
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import argbind'],
+            stderr=subprocess.PIPE, check=True
+        ).stderr.decode('utf-8')
+        imported = {}
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _self, cumulative, name = line[len('import time:'):].split('|')
+            imported[name.strip()] = int(cumulative)
+        times.append(imported['argbind'])
+    return min(times), sorted(imported)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument('--budget_us', type=int, default=5000)
+    p.add_argument('--repeats', type=int, default=5)
+    args = p.parse_args()
+
+    best, imported = measure(args.repeats)
+    eager = [m for m in LAZY_MODULES if m in imported]
+    result = {
+        'name': 'import_time',
+        'argbind_us': best,
+        'budget_us': args.budget_us,
+        'eagerly_imported': eager,
+    }
+    print(json.dumps(result))
+    if best > args.budget_us or eager:
+        sys.exit(1)
@@ -0,0 +1,79 @@
+"""Runs the benchmarks in benchmarks/benchmarks.py without asv, and 
+writes the results as JSON, one object per line, so they can be 
+compared across releases.
+
+Usage:
+    python benchmarks/run.py [--output results.jsonl] [--filter Scope] [--max_size 1000]
+"""
+import argparse
+import inspect
+import itertools
+import json
+import os
+import platform
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import benchmarks
+
+def _version():
+    try:
+        from importlib.metadata import version
+        return version('argbind')
+    except Exception:
+        return None
+
+def run(name_filter=None, max_size=None, min_time=0.2):
+    classes = [
+        cls for name, cls in inspect.getmembers(benchmarks, inspect.isclass)
+        if cls.__module__ == benchmarks.__name__ and not name.startswith('_')
+    ]
+    for cls in classes:
+        methods = [m for m in dir(cls) if m.startswith('time_')]
+        params = getattr(cls, 'params', [])
+        if params and not isinstance(params[0], list):
+            params = [params]
+        for param in itertools.product(*params):
+            if max_size is not None and param and isinstance(param[0], int) \
+                    and param[0] > max_size:
+                continue
+            for method in methods:
+                name = f'{cls.__name__}.{method}'
+                if name_filter and name_filter not in name:
+                    continue
+                bench = cls()
+                if hasattr(bench, 'setup'):
+                    bench.setup(*param)
+                try:
+                    fn = getattr(bench, method)
+                    timer = timeit.Timer(lambda: fn(*param))
+                    number, _ = timer.autorange()
+                    number = max(1, int(number * min_time / 0.2))
+                    seconds = min(timer.repeat(repeat=3, number=number)) / number
+                finally:
+                    if hasattr(bench, 'teardown'):
+                        bench.teardown(*param)
+                yield {
+                    'benchmark': name,
+                    'params': dict(zip(getattr(cls, 'param_names', []), param)),
+                    'seconds': seconds,
+                    'argbind_version': _version(),
+                    'python_version': platform.python_version(),
+                }
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument('--output', type=str, default=None,
+        help="File to append results to. Printed to stdout if not given.")
+    p.add_argument('--filter', type=str, default=None,
+        help="Only run benchmarks whose name contains this string.")
+    p.add_argument('--max_size', type=int, default=None,
+        help="Skip registries with more bound functions than this.")
+    args = p.parse_args()
+
+    output = open(args.output, 'a') if args.output else sys.stdout
+    for result in run(args.filter, args.max_size):
+        output.write(json.dumps(result) + '\n')
+        output.flush()
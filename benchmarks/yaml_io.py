@@ -0,0 +1,93 @@
+"""Benchmarks load_args and dump_args on large generated configs, with
+and without libyaml, and in the binary format.
+
+Usage:
+    python benchmarks/yaml_io.py [--n_keys 1000 10000] [--repeats 3]
+
+Prints one JSON object per configuration.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import yaml
+
+import argbind
+from argbind import argbind as _argbind
+
+def make_args(n_keys, list_length=16):
+    """Generates arguments like the ones parse_args produces, for
+    n_keys / 10 functions with 10 arguments each, some of them scoped.
+    """
+    args = {}
+    for i in range(n_keys):
+        key = f'func{i // 10}.arg{i % 10}'
+        kind = i % 5
+        if kind == 0:
+            val = i
+        elif kind == 1:
+            val = i / 7
+        elif kind == 2:
+            val = f'value_{i}'
+        elif kind == 3:
+            val = [j / 3 for j in range(list_length)]
+        else:
+            val = bool(i % 2)
+        if i % 11 == 0:
+            key = f'train/{key}'
+        args[key] = val
+    return args
+
+def best_of(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def run(n_keys, repeats):
+    args = make_args(n_keys)
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'args.yml')
+        for libyaml in (False, True):
+            if libyaml and not yaml.__with_libyaml__:
+                continue
+            if not libyaml:
+                # Force the pure Python implementations.
+                loader, dumper = _argbind._yaml_loader, _argbind._yaml_dumper
+                _argbind._yaml_loader = lambda: yaml.Loader
+                _argbind._yaml_dumper = lambda args: type(
+                    '_Dumper', (yaml.Dumper,), {'ignore_aliases': lambda *a: True})
+            try:
+                dump_s = best_of(lambda: argbind.dump_args(args, path), repeats)
+                load_s = best_of(lambda: argbind.load_args(path), repeats)
+            finally:
+                if not libyaml:
+                    _argbind._yaml_loader, _argbind._yaml_dumper = loader, dumper
+            results.append({
+                'name': 'yaml_io', 'n_keys': n_keys, 'format': 'yaml', 
+                'libyaml': libyaml, 'dump_s': dump_s, 'load_s': load_s,
+            })
+
+        path = os.path.join(tmpdir, 'args' + _argbind.BINARY_EXTENSION)
+        dump_s = best_of(lambda: argbind.dump_args(args, path), repeats)
+        load_s = best_of(lambda: argbind.load_args(path), repeats)
+        results.append({
+            'name': 'yaml_io', 'n_keys': n_keys, 'format': 'binary', 
+            'libyaml': False, 'dump_s': dump_s, 'load_s': load_s,
+        })
+    return results
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument('--n_keys', type=int, nargs='+', default=[1000, 10000])
+    p.add_argument('--repeats', type=int, default=3)
+    args = p.parse_args()
+
+    for n_keys in args.n_keys:
+        for result in run(n_keys, args.repeats):
+            print(json.dumps(result))
@@ -22,22 +22,26 @@ setup(
     classifiers=[
             "License :: OSI Approved :: MIT License",
             "Development Status :: 3 - Alpha",
-            "Programming Language :: Python :: 3.6",
-            "Programming Language :: Python :: 3.7",
-            "Programming Language :: Python :: 3.8",
+            "Programming Language :: Python :: 3.10",
+            "Programming Language :: Python :: 3.11",
+            "Programming Language :: Python :: 3.12",
+            "Programming Language :: Python :: 3.13",
             "Operating System :: POSIX :: Linux",
             "Operating System :: MacOS",
             "Operating System :: Microsoft :: Windows",
     ],
     keywords='command-line configuration yaml argument parsing',
     packages=find_packages(),  # Required
-    python_requires='>=3.5, <4',
+    python_requires='>=3.10, <4',
     install_requires=[
         'pyyaml',
         'docstring-parser',
     ],
+    entry_points={
+        'console_scripts': ['argbind=argbind.static:main'],
+    },
     extras_require={ 
-        'tests': ['pytest', 'pytest-cov', 'torch', 'torchvision'],
+        'tests': ['pytest', 'pytest-cov', 'torch', 'torchvision', 'numpy'],
         'examples': ['torch', 'torchvision']
     },
 )
\ No newline at end of file
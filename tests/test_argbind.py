@@ -5,3 +5,913 @@ def test_load_args():
     with open("examples/yaml/conf/base.yml") as f:
         arg2 = argbind.load_args(f)
     assert arg1 == arg2
+
+def test_yaml_dump_loaded_args(monkeypatch):
+    import sys
+    import yaml
+
+    monkeypatch.setattr(sys, 'argv', ['script.py'])
+    for args in [
+        argbind.load_args("examples/yaml/conf/base.yml"), argbind.parse_args()]:
+        assert yaml.safe_load(yaml.safe_dump(args)) == dict(args)
+        assert yaml.dump(args) == yaml.dump(dict(args))
+
+def test_bound_call_resolution():
+    @argbind.bind(without_prefix=True)
+    def resolve_fn(a, b: int = 1, c: int = 2, **kwargs):
+        return a, b, c, kwargs
+
+    args = {'b': 10, 'c': 20}
+    with argbind.scope(args):
+        assert resolve_fn(0) == (0, 10, 20, {})
+        assert resolve_fn(0, 5) == (0, 5, 20, {})
+        assert resolve_fn(0, c=7) == (0, 10, 7, {})
+        assert resolve_fn(0, d=3) == (0, 10, 20, {'d': 3})
+    assert resolve_fn(0) == (0, 1, 2, {})
+
+def test_scope_view():
+    @argbind.bind('train', without_prefix=True)
+    def scoped_fn(folder: str = 'default'):
+        return folder
+
+    args = {'folder': 'top', 'train/folder': 'train', 'other/folder': 'other'}
+    with argbind.scope(args):
+        assert scoped_fn() == 'top'
+    with argbind.scope(args, 'train'):
+        assert scoped_fn() == 'train'
+    with argbind.scope(args, 'other'):
+        assert scoped_fn() == 'other'
+
+    # Views read through to the arguments, so edits are picked up.
+    args['train/folder'] = 'edited'
+    with argbind.scope(args, 'train'):
+        assert scoped_fn() == 'edited'
+    args['val/folder'] = 'val'
+    with argbind.scope(args, 'val'):
+        assert scoped_fn() == 'val'
+
+def test_scope_view_key_changes():
+    import io
+
+    @argbind.bind(without_prefix=True)
+    def swapped_fn(x: int = 0):
+        return x
+
+    # Larger than the size under which scope indexes are not cached.
+    padding = {f'k{i}': i for i in range(20)}
+    text = '\n'.join(f'{k}: {v}' for k, v in padding.items())
+    for args in [dict(padding, x=1), argbind.load_args(io.StringIO(text + '\nx: 1'))]:
+        with argbind.scope(args, 'train'):
+            assert swapped_fn() == 1
+        # Swap a key for a scoped one, without changing the size.
+        del args['k0']
+        args['train/x'] = 9
+        with argbind.scope(args, 'train'):
+            assert swapped_fn() == 9
+            # The scoped key is removed from the live scope.
+            del args['train/x']
+            args['y'] = 2
+            assert swapped_fn() == 1
+        with argbind.scope(args, 'train'):
+            assert swapped_fn() == 1
+
+def test_scope_isolation():
+    import asyncio
+    import threading
+
+    @argbind.bind(without_prefix=True)
+    def isolated_fn(value: int = 0):
+        return value
+
+    async def task(value):
+        with argbind.scope({'value': value}):
+            await asyncio.sleep(0.01)
+            return isolated_fn()
+
+    async def main():
+        return await asyncio.gather(*[task(i) for i in range(5)])
+
+    assert asyncio.run(main()) == list(range(5))
+
+    results = {}
+    barrier = threading.Barrier(2)
+    def worker(value):
+        with argbind.scope({'value': value}):
+            barrier.wait()
+            results[value] = isolated_fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {1: 1, 2: 2}
+
+def test_lazy_help():
+    import argparse
+
+    @argbind.bind('lazy')
+    def lazy_help_fn(x: int = 1):
+        """Function with help.
+
+        Parameters
+        ----------
+        x : int, optional
+            Some help for x.
+        """
+
+    p = argbind.build_parser(lazy_help=True)
+    action = [a for a in p._actions if a.dest.endswith('lazy_help_fn.x')][0]
+    assert action.help is None
+    assert p.format_help() == argbind.build_parser().format_help()
+    assert action.help == 'Some help for x.'
+
+    # Parsers built with the default settings can be used as parents.
+    child = argparse.ArgumentParser(
+        parents=[argbind.build_parser()], add_help=False, 
+        formatter_class=argparse.RawTextHelpFormatter)
+    child_help = child.format_help()
+    assert 'Some help for x.' in child_help
+    assert 'Function with help.' in child_help
+
+def test_lazy_imports():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, argbind; "
+        "print(' '.join(m for m in ('yaml', 'docstring_parser', 'argparse', 'ast') "
+        "if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE)
+    assert output.stdout.decode('utf-8').strip() == ''
+
+def test_type_hints():
+    import inspect
+    import typing
+
+    for name in argbind.__dict__:
+        obj = getattr(argbind, name)
+        if inspect.isfunction(obj) or inspect.isclass(obj):
+            typing.get_type_hints(obj)
+
+def test_parser_cache(tmp_path, monkeypatch):
+    from typing import List
+    import pytest
+
+    @argbind.bind('cached')
+    def cached_fn(x: int = 1, y: List[float] = [1.0], z: bool = False):
+        """Cached function.
+
+        Parameters
+        ----------
+        x : int, optional
+            Some help for x.
+        """
+
+    p1 = argbind.build_parser(cache=str(tmp_path))
+    assert len(list(tmp_path.glob('parser-*.pkl'))) == 1
+
+    def _fail(prefix):
+        raise AssertionError("Bound functions should not be inspected.")
+    monkeypatch.setattr(argbind.argbind, '_function_spec', _fail)
+    p2 = argbind.build_parser(cache=str(tmp_path))
+
+    assert p1.format_help() == p2.format_help()
+    argv = ['--test_parser_cache.<locals>.cached_fn.y', '1 2.5']
+    assert vars(p2.parse_args(argv)) == vars(p1.parse_args(argv))
+
+    # Registering a converter misses the cache.
+    monkeypatch.setattr(argbind.argbind, '_TYPE_CONVERTERS', {})
+    argbind.register_converter(complex, complex)
+    with pytest.raises(AssertionError):
+        argbind.build_parser(cache=str(tmp_path))
+    monkeypatch.undo()
+
+    # A cache that can't be written to doesn't stop the parser being built.
+    unwritable = tmp_path / 'file'
+    unwritable.write_text('')
+    p3 = argbind.build_parser(cache=str(unwritable / 'cache'))
+    assert p3.format_help() == p1.format_help()
+
+def test_dump_args_libyaml(tmp_path, monkeypatch):
+    import yaml
+
+    args = {
+        'func.str': 'some string',
+        'func.unicode': 'héllo ' * 30,
+        'func.multiline': 'a\nb',
+        'func.list': [1, 2.5, 'x'],
+        'func.tuple': (1, 1.0, 'number1'),
+        'func.dict': {'x': 5, 'y': 'a'},
+        'train/func.str': 'train',
+    }
+    # Mapping keys that libyaml writes differently.
+    cases = [args] + [
+        {'func.dict': {key: 1}, 'func.str': 'x'} 
+        for key in ['', 'a' * 125, 'a ' * 64, 'a ' * 100]
+    ]
+    for i, case in enumerate(cases):
+        argbind.dump_args(case, tmp_path / f'c{i}.yml')
+
+    class _Dumper(yaml.Dumper):
+        def ignore_aliases(self, data):
+            return True
+    monkeypatch.setattr(argbind.argbind, '_yaml_dumper', lambda args: _Dumper)
+    for i, case in enumerate(cases):
+        argbind.dump_args(case, tmp_path / f'py{i}.yml')
+        assert (tmp_path / f'c{i}.yml').read_text() == (tmp_path / f'py{i}.yml').read_text()
+    loaded = argbind.load_args(tmp_path / 'c0.yml')
+    for key in ['func.str', 'func.list', 'func.tuple', 'func.dict', 'train/func.str']:
+        assert loaded[key] == args[key]
+
+def test_dump_args_format(tmp_path):
+    import io
+    import yaml
+
+    class _Dumper(yaml.Dumper):
+        def ignore_aliases(self, data):
+            return True
+
+    def old_dump(args):
+        # How dump_args separated functions before it streamed.
+        x = yaml.dump(args, Dumper=_Dumper)
+        prev_line = None
+        output = []
+        for line in x.split('\n'):
+            cur_line = line.split('.')[0].strip()
+            if not cur_line.startswith('-'):
+                if cur_line != prev_line and prev_line:
+                    line = f'\n{line}'
+                prev_line = line.split('.')[0].strip()
+            output.append(line)
+        return '\n'.join(output)
+
+    args = {
+        'args.load': 'conf.yml',
+        'func.list': [1, 2.5, 'x'],
+        'func.nested': {'a': {'b': [1, {'c': 2}]}, 'd.e': 'f'},
+        'func.tuple': (1, 'x'),
+        'other.list': [[1, 2], {'x': 'y'}],
+        'other.empty': [],
+        'train/func.list': ['a', 'b'],
+        'train/other.x': 1,
+        'val/func.x': 0.5,
+        'plain': 3,
+    }
+    argbind.dump_args(args, tmp_path / 'args.yml')
+    assert (tmp_path / 'args.yml').read_text() == old_dump(args)
+
+    assert (tmp_path / 'args.yml').read_text() == (
+        'args.load: conf.yml\n'
+        '\n'
+        'func.list:\n'
+        '- 1\n'
+        '- 2.5\n'
+        '- x\n'
+        'func.nested:\n'
+        '\n'
+        '  a:\n'
+        '\n'
+        '    b:\n'
+        '    - 1\n'
+        '    - c: 2\n'
+        '\n'
+        '  d.e: f\n'
+        '\n'
+        'func.tuple: !!python/tuple\n'
+        '- 1\n'
+        '- x\n'
+        '\n'
+        'other.empty: []\n'
+        'other.list:\n'
+        '- - 1\n'
+        '  - 2\n'
+        '- x: y\n'
+        '\n'
+        'plain: 3\n'
+        '\n'
+        'train/func.list:\n'
+        '- a\n'
+        '- b\n'
+        '\n'
+        'train/other.x: 1\n'
+        '\n'
+        'val/func.x: 0.5\n'
+        '\n'
+    )
+
+    # Chunks split anywhere give the same output.
+    text = yaml.dump(args, Dumper=_Dumper)
+    for size in [1, 3, 7]:
+        f = io.StringIO()
+        writer = argbind.argbind._SeparatingWriter(f)
+        for i in range(0, len(text), size):
+            writer.write(text[i:i + size])
+        writer.close()
+        assert f.getvalue() == old_dump(args)
+
+def test_load_args_includes(tmp_path, monkeypatch):
+    import pytest
+
+    base = tmp_path / 'base.yml'
+    base.write_text("func.x: 1\nfunc.y: 2\n")
+    for name in ['a', 'b', 'c']:
+        (tmp_path / f'{name}.yml').write_text(
+            f"$include:\n  - {base}\nfunc.{name}: {name}\n")
+    (tmp_path / 'exp.yml').write_text(
+        "$include:\n" + ''.join(f"  - {tmp_path / n}.yml\n" for n in 'abc') +
+        "func.y: 3\n")
+
+    parse_config = argbind.argbind._parse_config
+    parsed = []
+    def _parse_config(path):
+        parsed.append(path)
+        return parse_config(path)
+    monkeypatch.setattr(argbind.argbind, '_parse_config', _parse_config)
+
+    args = argbind.load_args(tmp_path / 'exp.yml')
+    assert parsed.count(str(base)) == 1
+    assert args['func.x'] == 1 and args['func.y'] == 3
+    assert [args[f'func.{n}'] for n in 'abc'] == ['a', 'b', 'c']
+    assert argbind.load_args(tmp_path / 'exp.yml', max_workers=4) == args
+
+    (tmp_path / 'a.yml').write_text(f"$include:\n  - {tmp_path / 'exp.yml'}\n")
+    with pytest.raises(ValueError, match='cycle'):
+        argbind.load_args(tmp_path / 'exp.yml')
+
+def test_stats(monkeypatch):
+    import asyncio
+    import atexit
+    import sys
+
+    @argbind.bind('train', without_prefix=True)
+    def profiled_fn(x: int = 1):
+        return x
+
+    prefix = profiled_fn.__qualname__
+    args = {'x': 1, 'train/x': 2}
+    with argbind.scope(args):
+        profiled_fn()
+    assert prefix not in argbind.stats()
+
+    argbind.profile()
+    try:
+        with argbind.scope(args):
+            profiled_fn()
+        with argbind.scope(args, 'train'):
+            profiled_fn()
+            profiled_fn()
+    finally:
+        argbind.profile(False)
+
+    profile = argbind.stats(reset=True)[prefix]
+    assert profile['']['calls'] == 1
+    assert profile['train']['calls'] == 2
+    record = profile['train']
+    assert record['total_time'] >= record['resolve_time'] >= 0
+    assert record['call_time'] == record['total_time'] - record['resolve_time']
+    assert argbind.stats() == {}
+
+    # Each iteration of an async generator is a call.
+    @argbind.bind()
+    async def profiled_gen(x: int = 1):
+        for i in range(x):
+            yield i
+
+    async def consume():
+        return [i async for i in profiled_gen()]
+
+    argbind.profile()
+    try:
+        with argbind.scope({f'{profiled_gen.__qualname__}.x': 3}):
+            assert asyncio.run(consume()) == [0, 1, 2]
+    finally:
+        argbind.profile(False)
+    assert argbind.stats(reset=True)[profiled_gen.__qualname__]['']['calls'] == 1
+
+    # --args.profile registers the exit hook that prints the stats once.
+    registered = []
+    monkeypatch.setattr(atexit, 'register', registered.append)
+    monkeypatch.setattr(argbind.argbind, '_PRINT_STATS_AT_EXIT', False)
+    monkeypatch.setattr(argbind.argbind, 'PARSE_FUNCS', {})
+    monkeypatch.setattr(sys, 'argv', ['script.py', '--args.profile=1'])
+    try:
+        argbind.parse_args()
+        argbind.parse_args()
+    finally:
+        argbind.profile(False)
+        argbind.stats(reset=True)
+    assert len(registered) == 1
+
+def test_record_used_args():
+    import sys
+    import threading
+
+    @argbind.bind('train', without_prefix=True)
+    def recorded_fn(a: int = 1, b: int = 2):
+        return a + b
+
+    args = {'a': 1, 'b': 2, 'train/a': 3}
+    try:
+        argbind.record_used_args('off')
+        with argbind.scope(args, record=True) as used:
+            recorded_fn()
+            with argbind.scope(args, 'train'):
+                recorded_fn(b=5)
+        assert used == {'a': 1, 'b': 2, 'train/a': 3}
+        assert argbind.get_used_args() == {}
+
+        argbind.record_used_args('last', max_size=2)
+        with argbind.scope(args):
+            recorded_fn()
+        with argbind.scope(args, 'train'):
+            recorded_fn()
+        assert list(argbind.get_used_args()) == ['train/a', 'train/b']
+
+        # Threads evicting each other's arguments.
+        argbind.record_used_args('last', max_size=4)
+        errors = []
+        def worker(i):
+            try:
+                with argbind.scope({f'{i}/a': i, f'{i}/b': i}, str(i)):
+                    for _ in range(5000):
+                        recorded_fn()
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+        assert errors == []
+        assert len(argbind.get_used_args()) <= 4
+    finally:
+        argbind.record_used_args('all')
+
+@argbind.bind(without_prefix=True)
+def swept_fn(lr: float = 0.1, batch_size: int = 16, seed: int = 0):
+    return lr * batch_size + seed
+
+def test_sweep():
+    base_args = {'lr': 0.1, 'batch_size': 16, 'seed': 1}
+    grid = {'lr': [0.5, 1.0], 'batch_size': [2, 4]}
+
+    serial = argbind.sweep(swept_fn, base_args, grid)
+    assert [r['result'] for r in serial] == [2.0, 3.0, 3.0, 5.0]
+    assert serial[0]['config'] == {'lr': 0.5, 'batch_size': 2}
+    assert serial[0]['used_args'] == {'lr': 0.5, 'batch_size': 2, 'seed': 1}
+
+    parallel = argbind.sweep(swept_fn, base_args, grid, workers=2)
+    assert parallel == serial
+
+    configs = [{'seed': 3}, {'seed': 4}]
+    results = argbind.sweep(swept_fn, base_args, configs)
+    assert [r['result'] for r in results] == [4.6, 5.6]
+
+class Generic:
+    def __init__(self, a, b: int = 1, c: int = 2, **kwargs):
+        self.values = (a, b, c, kwargs)
+
+class Specialized(Generic):
+    def __init__(self, a, b: int = 1, c: int = 2, **kwargs):
+        self.values = (a, b, c, kwargs)
+
+argbind.bind(Generic, 'train')
+argbind.bind(Specialized, 'train', specialize=True)
+
+def test_specialized_bind(capsys):
+    calls = [
+        ((0,), {}), ((0, 5), {}), ((0, 5, 6), {}),
+        ((0,), {'c': 7}), ((0, 5), {'b': 8}), ((0,), {'d': 3}),
+    ]
+    outputs = []
+    for cls in [Generic, Specialized]:
+        name = cls.__name__
+        args = {f'{name}.b': 10, f'{name}.c': 20, f'train/{name}.c': 30, 'args.debug': True}
+        with argbind.scope(args, 'train', record=True) as used:
+            values = [cls(*a, **k).values for a, k in calls]
+        used = {k.replace(name, 'cls'): v for k, v in used.items()}
+        output = capsys.readouterr().out.replace(name, 'cls')
+        outputs.append((values, used, output))
+    assert outputs[0] == outputs[1]
+    assert outputs[0][0][0] == (0, 10, 30, {})
+    assert outputs[0][0][2] == (0, 5, 6, {})
+
+def lazy_fn_a(x : int = 1):
+    return x
+
+def lazy_fn_b(y : int = 2):
+    return y
+
+def lazy_fn_c(z : int = 3):
+    return z
+
+def test_lazy_bind_module(monkeypatch):
+    import types
+    monkeypatch.setattr(argbind.argbind, 'PARSE_FUNCS', {})
+    module = types.ModuleType('lazy_module')
+    module.lazy_fn_a = lazy_fn_a
+    module.lazy_fn_b = lazy_fn_b
+    module.lazy_fn_c = lazy_fn_c
+    module.constant = 4
+
+    bound = argbind.bind_module(
+        module, names=['lazy_fn_a', 'lazy_fn_b', 'constant'], 
+        lazy=True, group='lazy_module'
+    )
+    assert 'lazy_fn_a' not in argbind.argbind.PARSE_FUNCS
+
+    with argbind.scope({'lazy_fn_a.x': 5}):
+        assert bound.lazy_fn_a() == 5
+    assert 'lazy_fn_a' in argbind.argbind.PARSE_FUNCS
+    assert 'lazy_fn_b' not in argbind.argbind.PARSE_FUNCS
+
+    p = argbind.build_parser(group='lazy_module')
+    dests = [action.dest for action in p._actions]
+    assert 'lazy_fn_b.y' in dests
+    assert 'lazy_fn_c.z' not in dests
+    assert not hasattr(bound, 'lazy_fn_c')
+    assert not hasattr(bound, 'constant')
+
+def test_static_parser(tmp_path, capsys):
+    import pathlib
+
+    examples = pathlib.Path(__file__).parent.parent / 'examples'
+    regression = pathlib.Path(__file__).parent / 'regression'
+    for path in [
+        'typing/with_argbind.py', 'bind_class/bind_class.py', 
+        'bind_existing/with_argbind.py', 'scoping/with_argbind.py',
+        'hello_world/with_argbind_positional.py', 'mnist/with_argbind.py',
+    ]:
+        p = argbind.build_static_parser(str(examples / path))
+        assert p.format_help() == (regression / f'{path}.help').read_text()
+
+    # Defaults that can't be evaluated are kept as their source.
+    unresolved = tmp_path / 'unresolved.py'
+    unresolved.write_text(
+        "import argbind\n@argbind.bind()\ndef f(scale: float = 1/3):\n    pass\n")
+    p = argbind.build_static_parser(str(unresolved))
+    assert vars(p.parse_args([]))['f.scale'] == '1/3'
+
+    script = str(examples / 'yaml' / 'main.py')
+    assert argbind.static.main(['check', 'examples/yaml/conf/exp1.yml', script]) == 0
+    (tmp_path / 'bad.yml').write_text("func.arg1: 3\nfunc.missing: 1\n")
+    assert argbind.static.main(['check', str(tmp_path / 'bad.yml'), script]) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "func.arg1: expected str, got int 3.",
+        "func.missing: not an argument of any bound function.",
+    ]
+
+def test_parse_args_inheritance(tmp_path, monkeypatch):
+    import sys
+
+    monkeypatch.setattr(argbind.argbind, 'PARSE_FUNCS', {})
+    @argbind.bind('train', without_prefix=True)
+    def inherited_fn(x: int = 1, y: int = 2, z: int = 3, w: int = 4):
+        return x, y, z, w
+
+    # Scoped arguments inherit top-level ones set on the command line.
+    monkeypatch.setattr(sys, 'argv', ['script.py', '--x=5', '--train/y=9'])
+    args = argbind.parse_args()
+    assert (args['train/x'], args['train/y'], args['train/z']) == (5, 9, 3)
+
+    # Loaded arguments overwrite defaults, and scoped ones that weren't
+    # loaded inherit the loaded top-level ones. Top-level arguments set
+    # on the command line override loaded scoped ones, unless those 
+    # were set on the command line too.
+    config = tmp_path / 'args.yml'
+    config.write_text("x: 10\ny: 20\nw: 50\ntrain/x: 30\ntrain/y: 31\ntrain/z: 40\n")
+    monkeypatch.setattr(sys, 'argv', [
+        'script.py', '--x=5', '--train/y=9', f'--args.load={config}'])
+    args = argbind.parse_args()
+    with argbind.scope(args):
+        assert inherited_fn() == (5, 20, 3, 50)
+    with argbind.scope(args, 'train'):
+        assert inherited_fn() == (5, 9, 40, 50)
+
+def test_converters(tmp_path, monkeypatch):
+    import enum
+    import sys
+    import pytest
+    from typing import List, Tuple, Dict, Optional
+
+    class Color(enum.Enum):
+        red = 'r'
+        blue = 'b'
+
+    convert = argbind.argbind._converter
+    assert convert(List[Tuple[int, float]])('1,2.5 3,4') == [(1, 2.5), (3, 4.0)]
+    assert convert(List[Tuple[int, float]])('[(1, 2.5)]') == [(1, 2.5)]
+    assert convert(Dict[str, List[int]])('a=1,2 b=3') == {'a': [1, 2], 'b': [3]}
+    assert convert(Dict)('x=5 y=a') == {'x': 5, 'y': 'a'}
+    assert convert(List[str])('"a b" c') == ['a b', 'c']
+    assert convert(Optional[int])('None') is None
+    assert convert(Optional[int])('3') == 3
+    assert convert(Color)('blue') is Color.blue
+    assert convert(Color)('b') is Color.blue
+    assert convert(List[int]) is convert(List[int])
+    # Only lists of numbers are read from files with @PATH.
+    assert convert(List[str])('@alice @bob') == ['@alice', '@bob']
+    with pytest.raises(ValueError):
+        convert(List[float])(f'@{tmp_path}/missing.npy')
+
+    monkeypatch.setattr(argbind.argbind, '_TYPE_CONVERTERS', {})
+    argbind.register_converter(complex, complex)
+    assert convert(List[complex])('1+2j 3') == [1+2j, 3+0j]
+
+    monkeypatch.setattr(argbind.argbind, 'PARSE_FUNCS', {})
+    @argbind.bind()
+    def converted_fn(
+        pairs: List[Tuple[int, float]] = None,
+        lr: float = 1.0,
+        color: Color = Color.red,
+    ):
+        return pairs, lr, color
+
+    config = tmp_path / 'args.yml'
+    prefix = converted_fn.__qualname__
+    config.write_text(
+        f"{prefix}.pairs: [[1, 2]]\n{prefix}.lr: 1e-3\n{prefix}.color: blue\n")
+    monkeypatch.setattr(sys, 'argv', ['script.py', f'--args.load={config}'])
+    args = argbind.parse_args()
+    with argbind.scope(args):
+        assert converted_fn() == ([(1, 2.0)], 1e-3, Color.blue)
+
+def test_array_arguments(tmp_path, monkeypatch):
+    import sys
+    import pytest
+    from typing import List
+    np = pytest.importorskip('numpy')
+
+    weights = np.arange(6, dtype=np.float32)
+    np.save(tmp_path / 'weights.npy', weights)
+    weights.tofile(tmp_path / 'weights.bin')
+
+    monkeypatch.setattr(argbind.argbind, 'PARSE_FUNCS', {})
+    @argbind.bind(without_prefix=True)
+    def array_fn(weights: List[float] = None, stats: np.ndarray = None):
+        return weights, stats
+
+    monkeypatch.setattr(sys, 'argv', [
+        'script.py', f'--weights=@{tmp_path}/weights.npy', 
+        f'--stats=@{tmp_path}/weights.bin:float32:2,3',
+        f'--args.save={tmp_path}/args.yml',
+    ])
+    args = argbind.parse_args()
+    with argbind.scope(args):
+        w, s = array_fn()
+    assert isinstance(w, np.memmap) and isinstance(s, np.memmap)
+    assert np.array_equal(w, weights)
+    assert np.array_equal(s, weights.reshape(2, 3))
+
+    saved = (tmp_path / 'args.yml').read_text()
+    assert '!array' in saved and '0.0' not in saved
+    loaded = argbind.load_args(tmp_path / 'args.yml')
+    for key, expected in [('weights', w), ('stats', s)]:
+        assert isinstance(loaded[key], np.memmap)
+        assert np.array_equal(loaded[key], expected)
+
+    # Paths with colons, like Windows paths with a drive letter.
+    monkeypatch.setattr(
+        argbind.argbind, '_load_array', lambda path, **kwargs: (path, kwargs))
+    reference = argbind.argbind._array_reference
+    assert reference(r'@C:\data\w.npy') == (r'C:\data\w.npy', {})
+    assert reference(r'@C:\data\w.bin:float32:3,2:8') == (
+        r'C:\data\w.bin', {'dtype': 'float32', 'shape': [3, 2], 'offset': 8})
+
+@argbind.bind()
+def watched_fn(x: int = 0, y: int = 0):
+    return x, y
+
+def test_watch(tmp_path):
+    import os
+    import queue
+    import signal
+
+    base = tmp_path / 'base.yml'
+    base.write_text("watched_fn.x: 1\n")
+    config = tmp_path / 'conf.yml'
+    config.write_text(f"$include:\n  - {base}\nwatched_fn.y: 2\nother.z: 3\n")
+
+    def touch(path, text):
+        path.write_text(text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    changes = queue.Queue()
+    watcher = argbind.watch(config, interval=0.01, on_change=changes.put)
+    args = watcher.args
+    args['train/watched_fn.x'] = args['watched_fn.x']
+    with watcher, argbind.scope(args, 'train'):
+        assert watched_fn() == (1, 2)
+
+        touch(base, "watched_fn.x: 5\n")
+        change = changes.get(timeout=5)
+        assert change['changed'] == {'watched_fn.x': 5, 'train/watched_fn.x': 5}
+        assert change['prefixes'] == {'watched_fn'}
+        assert watched_fn() == (5, 2)
+
+        config.write_text(f"$include:\n  - {base}\nwatched_fn.y: 2\nother.z: 4\n")
+        os.kill(os.getpid(), signal.SIGHUP)
+        change = changes.get(timeout=5)
+        assert change['changed'] == {'other.z': 4}
+        assert change['prefixes'] == set()
+
+    touch(base, "watched_fn.x: 6\n")
+    assert watcher.reload()['changed'] == {'watched_fn.x': 6, 'train/watched_fn.x': 6}
+
+    # Removing a scoped key from the file while in a scope of it.
+    padding = ''.join(f'k{i}: {i}\n' for i in range(20))
+    config.write_text(padding + "watched_fn.x: 1\ntrain/watched_fn.x: 2\n")
+    for args in [None, dict(argbind.load_args(config))]:
+        watcher = argbind.watch(config, args)
+        with argbind.scope(watcher.args, 'train'):
+            assert watched_fn() == (2, 0)
+            touch(config, padding + "watched_fn.x: 1\n")
+            assert watcher.reload()['removed'] == ['train/watched_fn.x']
+            assert watched_fn() == (1, 0)
+        touch(config, padding + "watched_fn.x: 1\ntrain/watched_fn.x: 2\n")
+
+def test_binary_args(tmp_path):
+    args = {
+        'func.none': None, 'func.bool': True, 'func.int': -3, 'func.big': 2**70,
+        'func.float': 1.5, 'func.str': 'héllo', 'func.ints': [1, 2, 3],
+        'func.floats': (1.0, 2.5), 'func.mixed': [1, 'a', (True, None)],
+        'func.dict': {'x': 5, 1: [0.5]}, 'func.empty': [], 'args.debug': False,
+    }
+    argbind.dump_args(args, tmp_path / 'args.argbind')
+    loaded = argbind.load_args(tmp_path / 'args.argbind')
+    assert loaded == args
+    assert type(loaded['func.floats']) is tuple
+    with open(tmp_path / 'args.argbind', 'rb') as f:
+        assert argbind.load_args(f) == args
+
+    # $include and $vars work across formats.
+    argbind.dump_args({'func.x': 1, 'func.y': 1}, tmp_path / 'base.argbind')
+    (tmp_path / 'exp.yml').write_text(
+        f"$include:\n  - {tmp_path / 'base.argbind'}\nfunc.y: 2\n")
+    argbind.dump_args({
+        '$include': [str(tmp_path / 'exp.yml')], 
+        '$vars': {'z': [1.0, 2.0]}, 'func.z': '$z',
+    }, tmp_path / 'top.argbind')
+    loaded = argbind.load_args(tmp_path / 'top.argbind')
+    assert (loaded['func.x'], loaded['func.y'], loaded['func.z']) == (1, 2, [1.0, 2.0])
+
+def test_chained_scope():
+    @argbind.bind(without_prefix=True)
+    def chained_fn(x: int = 0, y: int = 0, z: int = 0):
+        return x, y, z
+
+    args = {'x': 1, 'y': 1, 'z': 1, 'train/y': 2}
+    with argbind.scope(args, 'train'):
+        assert chained_fn() == (1, 2, 1)
+        with argbind.scope({'x': 3}, chain=True):
+            # The pattern of the active scope is kept.
+            assert chained_fn() == (3, 2, 1)
+            with argbind.scope({'train/z': 4}, chain=True, record=True) as used:
+                assert chained_fn() == (3, 2, 4)
+                assert chained_fn(y=5) == (3, 5, 4)
+            assert used == {'train/x': 3, 'train/y': 2, 'train/z': 4}
+            with argbind.scope({'y': 6}, '', chain=True):
+                assert chained_fn() == (3, 6, 1)
+        assert chained_fn() == (1, 2, 1)
+
+    # Chained views read through, so edits to any layer are seen.
+    overrides = {'x': 7}
+    with argbind.scope(args), argbind.scope(overrides, chain=True):
+        assert chained_fn() == (7, 1, 1)
+        args['y'] = 8
+        overrides['x'] = 9
+        assert chained_fn() == (9, 8, 1)
+        # Including keys added after they were first looked up.
+        overrides['z'] = 5
+        del args['x']
+        assert chained_fn() == (9, 8, 5)
+        del overrides['x']
+        assert chained_fn() == (0, 8, 5)
+
+def test_async_bind():
+    import asyncio
+    import inspect
+    from contextlib import asynccontextmanager
+
+    @argbind.bind(without_prefix=True)
+    async def async_fn(delay: float = 0.0, value: int = 0):
+        await asyncio.sleep(delay)
+        return value
+
+    @argbind.bind(without_prefix=True)
+    async def async_gen(start: int = 0):
+        value = start
+        while True:
+            try:
+                step = yield value
+            except ValueError:
+                step = -value
+            value += step or 1
+
+    @asynccontextmanager
+    @argbind.bind(without_prefix=True)
+    async def async_cm(name: str = 'default'):
+        yield name
+
+    assert inspect.iscoroutinefunction(async_fn)
+    assert inspect.isasyncgenfunction(async_gen)
+
+    async def task(value):
+        with argbind.scope({'value': value}):
+            return await async_fn(delay=0.01)
+
+    async def main():
+        # Arguments are resolved in the scope of the awaiting task, 
+        # not where the coroutine was created.
+        with argbind.scope({'value': 100}):
+            coro = async_fn()
+        with argbind.scope({'value': 1}):
+            assert await coro == 1
+        assert await asyncio.gather(*[task(i) for i in range(3)]) == [0, 1, 2]
+
+        with argbind.scope({'start': 10, 'name': 'scoped'}):
+            gen = async_gen()
+            assert await gen.__anext__() == 10
+            assert await gen.asend(5) == 15
+            assert await gen.athrow(ValueError()) == 0
+            await gen.aclose()
+            async with async_cm() as name:
+                assert name == 'scoped'
+
+    asyncio.run(main())
+
+def worker_layers():
+    return [type(layer).__name__ for layer in argbind.argbind._EXECUTOR_LAYERS]
+
+def sweep_worker_args():
+    return type(argbind.argbind._SWEEP_BASE_ARGS).__name__
+
+def test_executor():
+    args = {'lr': 1.0, 'batch_size': 2, 'seed': 0, 'train/seed': 10}
+    for processes in [False, True]:
+        with argbind.scope(args, 'train', record=True) as used:
+            with argbind.Executor(max_workers=2, processes=processes) as pool:
+                assert pool.submit(swept_fn).result() == 12.0
+                assert list(pool.map(swept_fn, [2.0, 3.0])) == [14.0, 16.0]
+                assert list(pool.map(swept_fn, [2.0, 3.0, 4.0], chunksize=2)) == [14.0, 16.0, 18.0]
+                # Other arguments are sent with the task.
+                with argbind.scope({'batch_size': 4}, chain=True):
+                    assert pool.submit(swept_fn).result() == 14.0
+                with argbind.scope({'lr': 0.5}):
+                    assert pool.submit(swept_fn).result() == 8.0
+        assert bool(used) == (not processes)
+
+    # Workers get versioned arguments, whose scope index they cache.
+    with argbind.scope(args):
+        with argbind.Executor(max_workers=1, processes=True) as pool:
+            assert pool.submit(worker_layers).result() == ['_ArgsDict']
+    run = argbind.sweep(sweep_worker_args, args, [{}], workers=1)[0]
+    assert run['result'] == '_ArgsDict'
+
+def test_shared_args():
+    import pickle
+    import pytest
+    from multiprocessing import shared_memory
+
+    args = {
+        'lr': 1.0, 'batch_size': 2, 'seed': 0, 'train/seed': 10,
+        'weights': [0.5] * 1000, 'name': 'run',
+    }
+    with argbind.share(args) as shared:
+        assert dict(shared) == args
+        assert shared.get('missing') is None
+        assert 'train/seed' in shared and len(shared) == len(args)
+
+        # Only the name of the block is pickled, and values are 
+        # decoded when they are looked up.
+        attached = pickle.loads(pickle.dumps(shared))
+        assert len(pickle.dumps(shared)) < 200
+        assert attached._values == {}
+        assert attached['name'] == 'run'
+        assert list(attached._values) == ['name']
+        attached.close()
+
+        with argbind.scope(shared, 'train'):
+            assert swept_fn() == 12.0
+            with argbind.Executor(max_workers=2, processes=True) as pool:
+                assert list(pool.map(swept_fn, [2.0, 3.0])) == [14.0, 16.0]
+                assert list(pool.map(swept_fn, [2.0, 3.0, 4.0], chunksize=2)) == [14.0, 16.0, 18.0]
+
+        results = argbind.sweep(swept_fn, shared, [{'seed': 1}], workers=1)
+        assert results[0]['result'] == 3.0
+        # Runs only decode the values they use.
+        with argbind.share(args) as unused:
+            argbind.sweep(swept_fn, unused, [{'seed': 1}, {'seed': 2}])
+            assert sorted(unused._values) == ['batch_size', 'lr']
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(shared.name)